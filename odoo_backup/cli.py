@@ -4,48 +4,237 @@ Odoo Backup Tool
 Interactive tool for backing up Odoo databases and filestore
 """
 
+import atexit
+import configparser
+import io
+import json
+import mmap
+import multiprocessing
 import os
+import re
 import sys
+import shutil
+import stat
 import subprocess
+import tarfile
 import zipfile
+import zlib
 import tempfile
-from pathlib import Path
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache, partial
+from itertools import chain, islice
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import click
-import psycopg2
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich.progress import track
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+try:
+    # Owner names for tar members; not available on Windows
+    import grp
+    import pwd
+except ImportError:
+    grp = pwd = None
+
+try:
+    # Optional: ISA-L provides SIMD-accelerated DEFLATE and CRC32
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+# CRC32 for zip members, folded with PCLMULQDQ when ISA-L is installed
+_crc32 = isal_zlib.crc32 if isal_zlib is not None else zlib.crc32
+
+# --config files are TOML; tomllib is in the standard library from 3.11, and
+# tomli (the same parser) is a dependency on older versions
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+try:
+    # Optional: needed for tar.zst backups
+    import zstandard
+except ImportError:
+    zstandard = None
 
 console = Console()
 
+# PostgreSQL connection pools, keyed by connection parameters
+_pools = {}
 
-def get_databases(host: str, port: int, user: str, password: str) -> List[str]:
-    """Get list of available databases"""
+# Set in compression worker processes: filestore files of the previous
+# incremental backup, {arcname: [size, mtime]}
+_previous_files = {}
+
+# Read size used when copying the pg_dump stream into the archive
+DUMP_CHUNK_SIZE = 1024 * 1024
+
+# Lines of pg_dump's stderr kept to report a failed dump
+PG_DUMP_ERROR_LINES = 200
+
+# Incremental backups list their filestore in a manifest stored in the
+# archive and next to it as <archive>.manifest.json
+MANIFEST_NAME = "filestore.manifest.json"
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Where cron keeps per-user crontabs (Debian/Ubuntu layout)
+CRON_SPOOL_DIR = "/var/spool/cron/crontabs"
+
+# An active (not commented out) crontab line running this tool, with its newline
+OBX_CRON_LINE = re.compile(r'^[^#\n]*\buvx[ \t]+obx\b.*\n?', re.M)
+
+# Write buffer of the backup file, so the headers and payloads of small
+# members are coalesced into large writes
+ARCHIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Buffer size for copying files into archives where sendfile is unavailable
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Filestore progress is advanced once per this many files in tar backups
+# (zip backups advance once per compressed batch)
+PROGRESS_STEP = 512
+
+# tar backups read filestore files ahead in this many threads, keeping up to
+# READ_AHEAD_FILES files of at most COPY_CHUNK_SIZE bytes in memory
+READER_THREADS = 8
+READ_AHEAD_FILES = 64
+
+# Shard directories listed concurrently. Listing waits on the filesystem
+# rather than the CPU, and on network filestores every readdir costs a round
+# trip, so this does not follow the CPU count
+SCAN_THREADS = 32
+
+# Filestore files are compressed in worker processes in batches of up to
+# FILESTORE_BATCH_SIZE files and FILESTORE_BATCH_BYTES bytes, with at most
+# FILESTORE_IN_FLIGHT_BYTES of them submitted at once whatever the CPU count;
+# files larger than MAX_BUFFERED_FILE_SIZE are streamed by the main process
+FILESTORE_BATCH_SIZE = 64
+FILESTORE_BATCH_BYTES = 16 * 1024 * 1024
+FILESTORE_IN_FLIGHT_BYTES = 128 * 1024 * 1024
+MAX_BUFFERED_FILE_SIZE = 8 * 1024 * 1024
+
+# tar.gz backups are compressed in blocks of this size, one gzip member per
+# block, so the blocks can be compressed in parallel
+GZIP_BLOCK_SIZE = 2 * 1024 * 1024
+
+# Default zstd level for tar.zst backups; levels 1-5 beat DEFLATE on both
+# speed and ratio, 3 is zstd's own default
+ZSTD_LEVEL = 3
+
+# File types that are already compressed; deflating them again only burns CPU
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.xz', '.png', '.jpg', '.jpeg', '.pdf', '.mp4', '.webp',
+    '.docx', '.xlsx',
+})
+
+# Leading bytes of already-compressed formats. Odoo names filestore files
+# after their checksum, without an extension, so they are recognised by
+# content: PNG, JPEG, GIF, PDF, zip (also docx/xlsx/odt), gzip, bzip2, xz,
+# zstd and 7z
+COMPRESSED_SIGNATURES = (
+    b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'%PDF', b'PK\x03\x04', b'\x1f\x8b',
+    b'BZh', b'\xfd7zXZ', b'\x28\xb5\x2f\xfd', b'7z\xbc\xaf',
+)
+
+# Bytes sampled from files without a known signature to probe compressibility
+COMPRESSIBILITY_SAMPLE = 4096
+
+
+def _isal_level(level: int) -> int:
+    """Map a zlib compression level (-1, 0-9) onto ISA-L's 0-3 range"""
+    if level < 0:
+        return isal_zlib.ISAL_DEFAULT_COMPRESSION
+    return min(3, (level + 2) // 3)
+
+
+class _IsalDeflate:
+    """Stand-in for the ``zlib`` module that compresses through ISA-L"""
+
+    def __getattr__(self, name):
+        return getattr(zlib, name)
+
+    @staticmethod
+    def compressobj(level=zlib.Z_DEFAULT_COMPRESSION, method=zlib.DEFLATED, wbits=zlib.MAX_WBITS):
+        return isal_zlib.compressobj(_isal_level(level), method, wbits)
+
+
+@contextmanager
+def fast_deflate():
+    """Route zipfile's DEFLATE compression and CRC32 through ISA-L when it is installed"""
+    if isal_zlib is None:
+        yield
+        return
+
+    original = zipfile.zlib, zipfile.crc32
+    zipfile.zlib, zipfile.crc32 = _IsalDeflate(), isal_zlib.crc32
     try:
-        conn = psycopg2.connect(
+        yield
+    finally:
+        zipfile.zlib, zipfile.crc32 = original
+
+
+def _get_pool(host: str, port: int, user: str, password: str, database: str):
+    """Return the connection pool for these parameters, creating it on first use"""
+    key = (host, port, user, password, database)
+    pool = _pools.get(key)
+    if pool is None:
+        # Imported on first use: runs given --database and --filestore-path
+        # never connect, and skip loading libpq altogether
+        import psycopg2.pool
+        pool = psycopg2.pool.ThreadedConnectionPool(
+            1, 4,
             host=host,
             port=port,
             user=user,
             password=password,
-            database='postgres'
+            database=database
         )
-        cur = conn.cursor()
-        cur.execute("SELECT datname FROM pg_database WHERE datistemplate = false;")
-        databases = [row[0] for row in cur.fetchall()]
-        cur.close()
-        conn.close()
-        return databases
+        _pools[key] = pool
+    return pool
+
+
+@atexit.register
+def _close_pools():
+    """Close every pooled PostgreSQL connection"""
+    for pool in _pools.values():
+        pool.closeall()
+    _pools.clear()
+
+
+@contextmanager
+def pg_connection(host: str, port: int, user: str, password: str, database: str = 'postgres'):
+    """Borrow a pooled PostgreSQL connection in autocommit mode"""
+    pool = _get_pool(host, port, user, password, database)
+    conn = pool.getconn()
+    # Read-only use: autocommit saves the BEGIN, and the ROLLBACK when the
+    # connection goes back to the pool
+    conn.autocommit = True
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+@lru_cache(maxsize=None)
+def get_databases(host: str, port: int, user: str, password: str) -> Tuple[str, ...]:
+    """Get list of available databases"""
+    try:
+        with pg_connection(host, port, user, password) as conn, conn.cursor() as cur:
+            cur.execute("SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname;")
+            return tuple(row[0] for row in cur.fetchall())
     except Exception as e:
         console.print(f"[red]Error connecting to PostgreSQL: {e}[/red]")
         sys.exit(1)
 
 
-def create_db_backup(host: str, port: int, user: str, password: str, database: str, output_file: str):
-    """Create database backup using pg_dump"""
+def _pg_dump_command(host: str, port: int, user: str, password: str, database: str):
+    """Build the base pg_dump command line and environment"""
     env = os.environ.copy()
     if password:
         env['PGPASSWORD'] = password
@@ -56,101 +245,729 @@ def create_db_backup(host: str, port: int, user: str, password: str, database: s
         '-p', str(port),
         '-U', user,
         '-d', database,
-        '--no-password',
-        '-f', output_file
+        '--no-password'
     ]
+    return cmd, env
 
+
+def _run_pg_dump(cmd: List[str], env: dict) -> bool:
+    """Run a pg_dump that writes its own output files"""
     try:
-        result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-        if result.returncode != 0:
-            console.print(f"[red]Error creating database backup: {result.stderr}[/red]")
-            return False
-        return True
+        # pg_dump writes to -f, so only the last lines of stderr are kept, and
+        # decoded on failure only
+        with subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE) as process:
+            errors = deque(process.stderr, maxlen=PG_DUMP_ERROR_LINES)
     except FileNotFoundError:
         console.print("[red]pg_dump not found. Please install PostgreSQL client tools.[/red]")
         return False
 
+    if process.returncode != 0:
+        message = b''.join(errors).decode('utf-8', 'replace').strip()
+        console.print(f"[red]Error creating database backup: {message}[/red]")
+        return False
+    return True
 
-def create_filestore_backup(filestore_path: str, temp_dir: str) -> str:
-    """Create filestore backup"""
-    filestore_backup = os.path.join(temp_dir, "filestore.zip")
 
-    if not os.path.exists(filestore_path):
-        console.print(f"[yellow]Filestore path not found: {filestore_path}[/yellow]")
-        return None
+@lru_cache(maxsize=None)
+def _pg_dump_major_version() -> int:
+    """Return the major version of the installed pg_dump, or 0 if unknown"""
+    try:
+        result = subprocess.run(['pg_dump', '--version'], capture_output=True, text=True)
+    except FileNotFoundError:
+        return 0
+    match = re.search(r"(\d+)", result.stdout)
+    return int(match.group(1)) if match else 0
+
+
+def _stream_dump(cmd: List[str], env: dict, zipf: zipfile.ZipFile, arcname: str,
+                 compress: bool = True) -> bool:
+    """Run pg_dump and copy its stdout into an archive entry, stored as-is unless ``compress``"""
+    member = arcname
+    if not compress:
+        member = zipfile.ZipInfo(arcname, time.localtime()[:6])
+        member.compress_type = zipfile.ZIP_STORED
+
+    # stderr goes to a file so a chatty pg_dump can never block the stdout pipe
+    with tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=errors)
+        except FileNotFoundError:
+            console.print("[red]pg_dump not found. Please install PostgreSQL client tools.[/red]")
+            return False
+
+        with process, zipf.open(member, 'w', force_zip64=True) as dump:
+            shutil.copyfileobj(process.stdout, dump, DUMP_CHUNK_SIZE)
+
+        if process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode('utf-8', 'replace').strip()
+            console.print(f"[red]Error creating database backup: {message}[/red]")
+            return False
+    return True
+
+
+def create_db_backup(host: str, port: int, user: str, password: str, database: str,
+                     zipf: zipfile.ZipFile, jobs: int = 1, pg_compress: Optional[str] = None) -> bool:
+    """Create database backup using pg_dump and add it to the backup archive"""
+    # One job streams plain SQL into {database}.sql; more jobs dump in parallel
+    # to a directory stored as {database}.dump/ (pg_restore -j N). pg_compress
+    # has pg_dump compress the dump itself, stored without compressing it again
+    cmd, env = _pg_dump_command(host, port, user, password, database)
+    if pg_compress:
+        cmd += ['--compress', pg_compress]
+
+    if jobs <= 1 and pg_compress:
+        return _stream_dump(cmd + ['-Fc'], env, zipf, f"{database}.dump", compress=False)
+    if jobs <= 1:
+        return _stream_dump(cmd, env, zipf, f"{database}.sql")
+
+    # Dump next to the backup rather than in /tmp, which is often a small tmpfs
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(zipf.filename))) as dump_root:
+        dump_dir = os.path.join(dump_root, f"{database}.dump")
+        if not _run_pg_dump(cmd + ['-Fd', '-j', str(jobs), '-f', dump_dir], env):
+            return False
+
+        # pg_dump already compressed the table data, so store the files as-is
+        for name in sorted(os.listdir(dump_dir)):
+            _write_stored_file(zipf, os.path.join(dump_dir, name), f"{database}.dump/{name}")
+    return True
+
+
+def _stat_entries(entries) -> List[Tuple[str, os.stat_result]]:
+    """Pair directory entries with their stat results, skipping files deleted since the listing"""
+    files = []
+    for entry in entries:
+        try:
+            # Symlinked files are followed, so both formats store their content
+            files.append((entry.path, entry.stat()))
+        except FileNotFoundError:
+            # Odoo's attachment garbage collector removes files from live filestores
+            pass
+    return files
+
+
+def _list_files(top: str) -> List[Tuple[str, os.stat_result]]:
+    """List every regular file below a directory with its stat result"""
+    files = []
+    stack = [top]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry)
+    # Inode order roughly follows placement on disk on ext4 and XFS, so it
+    # seeks less; the inode numbers come with the listing
+    if os.name == 'posix':
+        files.sort(key=os.DirEntry.inode)
+    return _stat_entries(files)
+
+
+def _map_bounded(pool, fn, items, window: int):
+    """Like pool.map, but keep at most ``window`` tasks in flight"""
+    items = iter(items)
+    pending = deque(pool.submit(fn, item) for item in islice(items, window))
+    while pending:
+        result = pending.popleft().result()
+        for item in islice(items, 1):
+            pending.append(pool.submit(fn, item))
+        yield result
+
+
+def _map_weighted(pool, fn, items, window: int, budget: int):
+    """Like _map_bounded for (item, weight) pairs, also keeping the total weight in flight within ``budget``"""
+    items = iter(items)
+    pending = deque()
+    in_flight = 0
+    upcoming = next(items, None)
+    while upcoming is not None or pending:
+        # A single task is always allowed, however heavy
+        while upcoming is not None and len(pending) < window and (
+                not pending or in_flight + upcoming[1] <= budget):
+            item, weight = upcoming
+            pending.append((pool.submit(fn, item), weight))
+            in_flight += weight
+            upcoming = next(items, None)
+        future, weight = pending.popleft()
+        in_flight -= weight
+        yield future.result()
+
+
+def _scan_root(root: str) -> Tuple[Tuple[str, ...], Tuple[os.DirEntry, ...]]:
+    """List the shard directories and loose files at the top of a filestore"""
+    # Not cached: the backup runs after the prompts and the dump, and must see
+    # shards created since detection
+    shards = []
+    files = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shards.append(entry.path)
+            elif entry.is_file():
+                files.append(entry)
+    return tuple(shards), tuple(files)
+
+
+def iter_filestore_files(filestore_path: str, arcroot: str = "filestore"):
+    """Yield (path, arcname, stat) for every file in the filestore, under ``arcroot``"""
+    root = os.path.normpath(filestore_path)
+    # Every path below comes from os.scandir(root), so it starts with root
+    # and the archive name is a plain slice (no relpath per file)
+    prefix_len = len(os.path.join(root, ''))
+    arcroot += os.sep
+
+    shards, files = _scan_root(root)
+    for path, st in _stat_entries(files):
+        yield path, arcroot + path[prefix_len:], st
+
+    # Each shard (Odoo's two-character sub-directories) is listed in a worker
+    # thread while the caller consumes the shards already listed
+    with ThreadPoolExecutor(max_workers=SCAN_THREADS) as pool:
+        for files in _map_bounded(pool, _list_files, shards, SCAN_THREADS * 2):
+            for path, st in files:
+                yield path, arcroot + path[prefix_len:], st
+
+
+def _compress(data, level: int, wbits: int) -> bytes:
+    """Compress a whole buffer in one call, using ISA-L when it is installed"""
+    if isal_zlib is not None:
+        return isal_zlib.compress(data, level=_isal_level(level), wbits=wbits)
+    # zlib.compress only takes wbits from Python 3.11
+    compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _raw_deflate(data, level: int) -> bytes:
+    """Compress a buffer into a raw DEFLATE stream, as zip members store it"""
+    return _compress(data, level, -15)
+
+
+def _gzip_member(data: bytes, level: int) -> bytes:
+    """Compress a block into a complete gzip member"""
+    return _compress(data, level, 31)
+
+
+class _ParallelGzipWriter:
+    """Write-only file object that gzips its input on all CPUs"""
+
+    # Blocks of GZIP_BLOCK_SIZE are compressed in a thread pool (zlib and ISA-L
+    # release the GIL) and written in order as concatenated gzip members, which
+    # gzip and tar read as one stream
+    def __init__(self, fileobj, level: int):
+        self._fileobj = fileobj
+        self._level = level
+        self._buffer = bytearray()
+        workers = os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()
+        self._window = workers * 2
+
+    def _submit(self, block: bytes):
+        if len(self._pending) >= self._window:
+            self._fileobj.write(self._pending.popleft().result())
+        self._pending.append(self._pool.submit(_gzip_member, block, self._level))
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= GZIP_BLOCK_SIZE:
+            self._submit(bytes(self._buffer[:GZIP_BLOCK_SIZE]))
+            del self._buffer[:GZIP_BLOCK_SIZE]
+        return len(data)
+
+    def close(self):
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().result())
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _is_compressed(path: str, head: bytes) -> bool:
+    """Tell whether a file is already compressed, from its name or first bytes"""
+    if (os.path.splitext(path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS
+            or head.startswith(COMPRESSED_SIGNATURES)):
+        return True
+    # A full sample that level 1 DEFLATE cannot shrink by 5% counts as compressed
+    if len(head) < COMPRESSIBILITY_SAMPLE:
+        return False
+    return len(_raw_deflate(head, 1)) > len(head) * 0.95
+
+
+def _init_compress_worker(previous_files: dict):
+    """Give a compression worker the manifest of the previous backup"""
+    global _previous_files
+    _previous_files = previous_files
+
+
+def _compress_batch(files, level: int):
+    """Compress a batch of filestore files in a worker process, returning (members, seen)"""
+    # members holds (info, payload, path), with a None payload for files too
+    # large to buffer, which the main process streams; seen holds the manifest
+    # entries, including files unchanged since the previous backup
+    members = []
+    seen = {}
+    with ExitStack() as stack:
+        # Open the whole batch first and ask the kernel to read it ahead, so
+        # the reads for later files overlap with compressing earlier ones
+        batch = []
+        # The stat results come from the walk, so no file is stat'd twice
+        for path, arcname, st in files:
+            info = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+            info.external_attr = (st.st_mode & 0xFFFF) << 16
+            info.file_size = st.st_size
+            entry = [st.st_size, int(st.st_mtime)]
+            if _previous_files.get(info.filename) == entry:
+                seen[info.filename] = entry
+                continue
+            try:
+                if info.file_size > MAX_BUFFERED_FILE_SIZE:
+                    with open(path, 'rb') as f:
+                        if not level or _is_compressed(path, f.read(COMPRESSIBILITY_SAMPLE)):
+                            info.compress_type = zipfile.ZIP_STORED
+                        else:
+                            info.compress_type = zipfile.ZIP_DEFLATED
+                    members.append((info, None, path))
+                else:
+                    fd = os.open(path, os.O_RDONLY)
+                    stack.callback(os.close, fd)
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                    batch.append((info, fd, path))
+            except FileNotFoundError:
+                continue
+            seen[info.filename] = entry
+
+        for info, fd, path in batch:
+            # A single read of the known size, instead of the fstat, read and
+            # read-to-EOF a buffered file object does. A read may still come
+            # back short (FUSE, CIFS, signals), so keep reading until the size
+            data = os.read(fd, info.file_size)
+            while len(data) < info.file_size:
+                chunk = os.read(fd, info.file_size - len(data))
+                if not chunk:
+                    raise OSError(f"{path} shrank while it was being backed up")
+                data += chunk
+            info.CRC = _crc32(data)
+
+            payload = data
+            info.compress_type = zipfile.ZIP_STORED
+            if level and not _is_compressed(path, data[:COMPRESSIBILITY_SAMPLE]):
+                deflated = _raw_deflate(data, level)
+                if len(deflated) < len(data):
+                    payload = deflated
+                    info.compress_type = zipfile.ZIP_DEFLATED
+            info.compress_size = len(payload)
+            members.append((info, payload, path))
+    return members, seen
+
+
+def _begin_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """Write the local header of a member whose CRC and sizes are known"""
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    zipf._writecheck(info)
+    # Seeking flushes the write buffer, so only seek when a member left the
+    # file position elsewhere; back-to-back members stay in one buffered write
+    if zipf.fp.tell() != zipf.start_dir:
+        zipf.fp.seek(zipf.start_dir)
+    info.header_offset = zipf.start_dir
+    zipf.fp.write(info.FileHeader(zip64))
+
+
+def _end_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """Register a member written with _begin_member in the central directory"""
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(info)
+    zipf.NameToInfo[info.filename] = info
+    zipf._didModify = True
+
+
+def _write_compressed_member(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, payload: bytes):
+    """Append a member whose data is already compressed to an open ZipFile"""
+    _begin_member(zipf, info)
+    zipf.fp.write(payload)
+    _end_member(zipf, info)
+
+
+def _write_stored_file(zipf: zipfile.ZipFile, path: str, arcname: str):
+    """Append a file to an open ZipFile without compressing it"""
+    # CRC over a memory map, then the bytes are copied with sendfile on Linux
+    # so they never pass through a Python buffer
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    info.compress_type = zipfile.ZIP_STORED
+
+    with open(path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        info.file_size = info.compress_size = size
+        info.CRC = 0
+        if size:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if hasattr(data, 'madvise'):
+                    data.madvise(mmap.MADV_SEQUENTIAL)
+                info.CRC = _crc32(data)
+
+        _begin_member(zipf, info)
+        out = zipf.fp
+        if sys.platform.startswith('linux') and size:
+            start = out.tell()
+            out.flush()
+            copied = 0
+            while copied < size:
+                sent = os.sendfile(out.fileno(), src.fileno(), copied, size - copied)
+                if not sent:
+                    raise OSError(f"{path} shrank while it was being backed up")
+                copied += sent
+            out.seek(start + size)
+        else:
+            shutil.copyfileobj(src, out, COPY_CHUNK_SIZE)
+        _end_member(zipf, info)
+
+
+def _write_deflated_file(zipf: zipfile.ZipFile, path: str, info: zipfile.ZipInfo, level: int):
+    """Deflate a large file into an open ZipFile straight from a memory map"""
+    # Fed in COPY_CHUNK_SIZE slices rather than zipfile.write()'s 8 KiB reads
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info._compresslevel = level
+    with open(path, 'rb') as src, zipf.open(info, 'w', force_zip64=True) as dest:
+        if not info.file_size:
+            return
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+            if hasattr(data, 'madvise'):
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            for offset in range(0, len(view), COPY_CHUNK_SIZE):
+                dest.write(view[offset:offset + COPY_CHUNK_SIZE])
+
+
+def _filestore_progress() -> Progress:
+    """Progress display for a filestore walk of unknown length"""
+    # Callers advance it in steps, and it redraws a few times per second
+    return Progress(SpinnerColumn(), TextColumn("{task.description}"),
+                    TextColumn("{task.completed} files"), TimeElapsedColumn(),
+                    console=console, refresh_per_second=4)
+
+
+def _filestore_batches(files):
+    """Group (path, arcname, stat) tuples into (batch, bytes) pairs for _compress_batch"""
+    batch = []
+    batch_bytes = 0
+    for path, arcname, st in files:
+        # Files the workers stream rather than buffer count for nothing
+        size = st.st_size if st.st_size <= MAX_BUFFERED_FILE_SIZE else 0
+        if batch and (len(batch) == FILESTORE_BATCH_SIZE or batch_bytes + size > FILESTORE_BATCH_BYTES):
+            yield batch, batch_bytes
+            batch = []
+            batch_bytes = 0
+        batch.append((path, arcname, st))
+        batch_bytes += size
+    if batch:
+        yield batch, batch_bytes
+
+
+def create_filestore_backup(zipf: zipfile.ZipFile, filestore_path: str, level: int = 1,
+                            previous_files: Optional[dict] = None, manifest: Optional[dict] = None):
+    """Add the filestore to the backup archive under ``filestore/``"""
+    # Workers compress batches and this process only appends the finished
+    # members. Files with the same size and mtime in previous_files are
+    # skipped; every file seen is recorded in manifest
+    # An empty filestore needs no worker processes
+    files = iter_filestore_files(filestore_path)
+    first = next(files, None)
+    if first is None:
+        return
+
+    batches = _filestore_batches(chain([first], files))
+    workers = os.cpu_count() or 1
+    if sys.platform == 'win32':
+        # ProcessPoolExecutor refuses more than 61 workers on Windows
+        workers = min(workers, 61)
+    # The scan and progress threads are already running, so the workers are
+    # not forked from this process
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(start_method)
+
+    progress = _filestore_progress()
+    with progress, ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                       initializer=_init_compress_worker,
+                                       initargs=(previous_files or {},)) as pool:
+        task = progress.add_task("Backing up filestore...", total=None)
+        for members, seen in _map_weighted(pool, partial(_compress_batch, level=level), batches,
+                                           workers * 2, FILESTORE_IN_FLIGHT_BYTES):
+            for info, payload, path in members:
+                if payload is not None:
+                    _write_compressed_member(zipf, info, payload)
+                    continue
+                # Large files are opened again here, before anything of the
+                # member is written; skip those deleted in the meantime
+                try:
+                    if info.compress_type == zipfile.ZIP_STORED:
+                        _write_stored_file(zipf, path, info.filename)
+                    else:
+                        _write_deflated_file(zipf, path, info, level)
+                except FileNotFoundError:
+                    del seen[info.filename]
+
+            if manifest is not None:
+                manifest.update(seen)
+            progress.advance(task, len(seen))
+
+
+def _read_manifest(path: str) -> Optional[dict]:
+    """Read an incremental manifest sidecar, or None if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        if isinstance(manifest['archive'], str) and isinstance(manifest['files'], dict):
+            manifest.setdefault('base', None)
+            return manifest
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
 
-    with zipfile.ZipFile(filestore_backup, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        filestore_path_obj = Path(filestore_path)
-        for file_path in track(list(filestore_path_obj.rglob('*')), description="Backing up filestore..."):
-            if file_path.is_file():
-                arcname = file_path.relative_to(filestore_path_obj.parent)
-                zipf.write(file_path, arcname)
 
-    return filestore_backup
+def _find_manifest(output_path: str, database: str) -> Tuple[Optional[str], dict]:
+    """Load the newest incremental manifest as (archive, files), or (None, {}) if there is no intact chain"""
+    pattern = re.compile(rf"{re.escape(database)}_\d{{8}}_\d{{6}}\..+{re.escape(MANIFEST_SUFFIX)}$")
+    try:
+        names = sorted(name for name in os.listdir(output_path) if pattern.match(name))
+    except FileNotFoundError:
+        return None, {}
+    if not names:
+        return None, {}
+
+    # Restoring needs every archive of the chain, so building on a chain with
+    # a deleted archive (e.g. rotated without its sidecar) would lose files
+    newest = _read_manifest(os.path.join(output_path, names[-1]))
+    problem = None if newest else f"{names[-1]} is unreadable"
+    manifest = newest
+    archives = set()
+    while not problem:
+        archive, base = manifest['archive'], manifest['base']
+        if not os.path.isfile(os.path.join(output_path, archive)):
+            problem = f"{archive} is missing"
+        elif base is None:
+            return newest['archive'], newest['files']
+        elif base in archives:
+            problem = f"{base} is its own base"
+        else:
+            archives.add(archive)
+            manifest = _read_manifest(os.path.join(output_path, base + MANIFEST_SUFFIX))
+            if manifest is None:
+                problem = f"{base}{MANIFEST_SUFFIX} is missing or unreadable"
 
+    console.print(f"[yellow]⚠ Incremental chain is broken ({problem}); making a full backup[/yellow]")
+    return None, {}
+
+
+def _manifest_json(backup_path: str, base: Optional[str], files: dict) -> str:
+    """Serialize an incremental manifest"""
+    return json.dumps({
+        'archive': os.path.basename(backup_path),
+        'base': base,
+        'files': files,
+    })
 
-def create_full_backup(db_backup: str, filestore_backup: Optional[str], output_path: str, database: str):
-    """Create final ZIP backup with database and filestore"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"{database}_{timestamp}.zip"
-    full_backup_path = os.path.join(output_path, backup_filename)
 
+def _backup_path(output_path: str, database: str, extension: str) -> str:
+    """Build a timestamped backup file path, creating the output directory"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     os.makedirs(output_path, exist_ok=True)
+    return os.path.join(output_path, f"{database}_{timestamp}.{extension}")
+
 
-    with zipfile.ZipFile(full_backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add database backup
-        zipf.write(db_backup, f"{database}.sql")
+def create_full_backup(host: str, port: int, user: str, password: str, database: str,
+                       filestore_path: Optional[str], output_path: str, level: int = 1,
+                       jobs: int = 1, incremental: bool = False,
+                       pg_compress: Optional[str] = None) -> Optional[str]:
+    """Create final ZIP backup with database and filestore"""
+    # Dump and filestore go straight into the archive, without intermediate files
+    base, previous_files = _find_manifest(output_path, database) if incremental else (None, {})
+    manifest = {} if incremental else None
+    full_backup_path = _backup_path(output_path, database, "zip")
+    compression = zipfile.ZIP_DEFLATED if level else zipfile.ZIP_STORED
+
+    with fast_deflate(), open(full_backup_path, 'w+b', buffering=ARCHIVE_BUFFER_SIZE) as out, \
+            zipfile.ZipFile(out, 'w', compression, compresslevel=level or None) as zipf:
+        # Add database backup, streamed straight from pg_dump
+        success = create_db_backup(host, port, user, password, database, zipf, jobs, pg_compress)
 
         # Add filestore if exists
-        if filestore_backup and os.path.exists(filestore_backup):
-            zipf.write(filestore_backup, "filestore.zip")
+        if success and filestore_path and _is_dir(filestore_path):
+            console.print("📁 Backing up filestore...")
+            create_filestore_backup(zipf, filestore_path, level, previous_files, manifest)
+
+        if success and incremental:
+            manifest_json = _manifest_json(full_backup_path, base, manifest)
+            zipf.writestr(MANIFEST_NAME, manifest_json)
+
+    if not success:
+        os.remove(full_backup_path)
+        return None
+
+    if incremental:
+        with open(full_backup_path + MANIFEST_SUFFIX, 'w') as f:
+            f.write(manifest_json)
 
     return full_backup_path
 
 
-def parse_odoo_config_file(config_path: str) -> Optional[str]:
-    """Parse Odoo configuration file to extract data_dir"""
+@lru_cache(maxsize=None)
+def _owner_names(uid: int, gid: int) -> Tuple[str, str]:
+    """Look up the user and group names stored in tar headers"""
+    uname = gname = ""
     try:
-        with open(config_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('data_dir') and '=' in line:
-                    data_dir = line.split('=', 1)[1].strip()
-                    # Remove quotes if present
-                    data_dir = data_dir.strip('"\'')
-                    if data_dir and os.path.exists(data_dir):
-                        console.print(f"[green]✓ Found data_dir in {config_path}: {data_dir}[/green]")
-                        return data_dir
-    except Exception as e:
-        console.print(f"[dim]Could not read config file {config_path}: {e}[/dim]")
-    return None
-
+        uname = pwd.getpwuid(uid).pw_name
+    except (AttributeError, KeyError):
+        pass
+    try:
+        gname = grp.getgrgid(gid).gr_name
+    except (AttributeError, KeyError):
+        pass
+    return uname, gname
 
-def get_odoo_data_dir() -> Optional[str]:
-    """Try to detect Odoo data_dir from configuration"""
 
-    # Method 1: Try to import Odoo and get data_dir from config
+def _tar_info(arcname: str, st: os.stat_result) -> Optional[tarfile.TarInfo]:
+    """Build the tar header of a filestore file from its stat result, None if not a regular file"""
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    # Unlike TarFile.gettarinfo, owner names are looked up once, not per file
+    info = tarfile.TarInfo(arcname)
+    info.mode = stat.S_IMODE(st.st_mode)
+    info.uid = st.st_uid
+    info.gid = st.st_gid
+    info.size = st.st_size
+    info.mtime = st.st_mtime
+    info.uname, info.gname = _owner_names(st.st_uid, st.st_gid)
+    return info
+
+
+def _read_tar_member(member):
+    """Read a filestore file for a tar backup, unless it is too large to buffer"""
+    tarinfo, path = member
+    if not tarinfo.isreg() or tarinfo.size > COPY_CHUNK_SIZE:
+        return tarinfo, path, None
     try:
-        import odoo
-        from odoo.tools import config
+        with open(path, 'rb') as f:
+            return tarinfo, path, f.read()
+    except FileNotFoundError:
+        # Deleted since the walk: left to the caller, whose own open fails in turn
+        return tarinfo, path, None
+
+
+def create_tar_backup(host: str, port: int, user: str, password: str, database: str,
+                      filestore_path: Optional[str], output_path: str, jobs: int = 1,
+                      incremental: bool = False, level: int = ZSTD_LEVEL,
+                      codec: str = 'zst', pg_compress: Optional[str] = None) -> Optional[str]:
+    """Create final tar.zst, tar.gz or plain tar backup with database and filestore"""
+    base, previous_files = _find_manifest(output_path, database) if incremental else (None, {})
+    manifest = {}
+    cmd, env = _pg_dump_command(host, port, user, password, database)
+
+    def skip_unchanged(tarinfo):
+        if tarinfo is None or not tarinfo.isfile():
+            return tarinfo
+        entry = [tarinfo.size, int(tarinfo.mtime)]
+        manifest[tarinfo.name] = entry
+        return None if previous_files.get(tarinfo.name) == entry else tarinfo
+
+    # tar needs each member's size up front, so the dump cannot be streamed
+    # in; it goes next to the backup rather than in /tmp, often a small tmpfs
+    full_backup_path = _backup_path(output_path, database, f"tar.{codec}" if level else "tar")
+    with tempfile.TemporaryDirectory(dir=output_path) as dump_root:
+        if jobs > 1:
+            db_backup = os.path.join(dump_root, f"{database}.dump")
+            cmd += ['-Fd', '-j', str(jobs), '--compress', pg_compress or '0']
+        elif pg_compress:
+            db_backup = os.path.join(dump_root, f"{database}.dump")
+            cmd += ['-Fc', '--compress', pg_compress]
+        else:
+            db_backup = os.path.join(dump_root, f"{database}.sql")
+
+        if not _run_pg_dump(cmd + ['-f', db_backup], env):
+            return None
+
+        with ExitStack() as stack:
+            writer = stack.enter_context(open(full_backup_path, 'wb', buffering=ARCHIVE_BUFFER_SIZE))
+            if level and codec == 'zst':
+                compressor = zstandard.ZstdCompressor(level=level, threads=os.cpu_count() or 1)
+                writer = stack.enter_context(compressor.stream_writer(writer))
+            elif level:
+                writer = stack.enter_context(_ParallelGzipWriter(writer, level))
+            tar = stack.enter_context(tarfile.open(fileobj=writer, mode='w|', copybufsize=COPY_CHUNK_SIZE))
+            tar.add(db_backup, arcname=os.path.basename(db_backup))
+            if filestore_path and _is_dir(filestore_path):
+                console.print("📁 Backing up filestore...")
+                # Walk with os.scandir instead of tar.add's recursive sorted
+                # listdir; reader threads fetch the next files while the
+                # current one is written
+                members = ((_tar_info(arcname, st), path)
+                           for path, arcname, st in iter_filestore_files(filestore_path))
+                if incremental:
+                    members = ((skip_unchanged(tarinfo), path) for tarinfo, path in members)
+                members = (member for member in members if member[0] is not None)
+
+                progress = _filestore_progress()
+                with progress, ThreadPoolExecutor(max_workers=READER_THREADS) as pool:
+                    task = progress.add_task("Backing up filestore...", total=None)
+                    count = 0
+                    for tarinfo, path, data in _map_bounded(pool, _read_tar_member, members,
+                                                            READ_AHEAD_FILES):
+                        if data is not None:
+                            tar.addfile(tarinfo, io.BytesIO(data))
+                        else:
+                            try:
+                                f = open(path, 'rb')
+                            except FileNotFoundError:
+                                # Deleted since the walk listed it
+                                manifest.pop(tarinfo.name, None)
+                                continue
+                            with f:
+                                tar.addfile(tarinfo, f)
+                        count += 1
+                        if count % PROGRESS_STEP == 0:
+                            progress.advance(task, PROGRESS_STEP)
+                    progress.advance(task, count % PROGRESS_STEP)
+
+            if incremental:
+                manifest_json = _manifest_json(full_backup_path, base, manifest)
+                data = manifest_json.encode()
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+
+    if incremental:
+        with open(full_backup_path + MANIFEST_SUFFIX, 'w') as f:
+            f.write(manifest_json)
 
-        # Initialize Odoo config if not already done
-        if not hasattr(config, 'loaded'):
-            config.parse_config()
+    return full_backup_path
 
-        data_dir = config.get('data_dir')
+
+def parse_odoo_config_file(config_path: str) -> Optional[str]:
+    """Parse Odoo configuration file to extract data_dir"""
+    parser = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        with open(config_path, 'r') as f:
+            parser.read_file(f)
+        # Remove quotes if present
+        data_dir = parser.get('options', 'data_dir', fallback='').strip('"\'')
         if data_dir and os.path.exists(data_dir):
-            console.print(f"[green]✓ Found Odoo data_dir from config: {data_dir}[/green]")
+            console.print(f"[green]✓ Found data_dir in {config_path}: {data_dir}[/green]")
             return data_dir
-        elif data_dir:
-            console.print(f"[yellow]Found data_dir in config but path doesn't exist: {data_dir}[/yellow]")
-    except ImportError:
-        console.print("[dim]Odoo not available in Python path[/dim]")
     except Exception as e:
-        console.print(f"[dim]Could not read Odoo config: {e}[/dim]")
+        console.print(f"[dim]Could not read config file {config_path}: {e}[/dim]")
+    return None
 
-    # Method 2: Try to find and parse Odoo configuration files
-    config_locations = [
+
+def _config_locations() -> Tuple[str, ...]:
+    """List the Odoo configuration files to look for, expanded and deduplicated"""
+    locations = [
         "/etc/odoo/odoo.conf",
         "/etc/odoo.conf",
         "/etc/odoo/odoo-server.conf",
@@ -169,119 +986,163 @@ def get_odoo_data_dir() -> Optional[str]:
         appdata = os.environ.get('APPDATA', '')
         programfiles = os.environ.get('PROGRAMFILES', 'C:\\Program Files')
         if appdata:
-            config_locations.extend([
+            locations.extend([
                 os.path.join(appdata, "Odoo", "odoo.conf"),
                 os.path.join(appdata, "odoo.conf"),
             ])
-        config_locations.extend([
+        locations.extend([
             os.path.join(programfiles, "Odoo", "server", "odoo.conf"),
             os.path.join(programfiles, "Odoo", "odoo.conf"),
             "C:\\odoo\\odoo.conf",
         ])
 
+    return tuple(dict.fromkeys(os.path.expanduser(path) for path in locations))
+
+
+# Odoo configuration files to read data_dir from, in priority order; built
+# once at import since neither the platform nor the home directory changes
+CONFIG_LOCATIONS = _config_locations()
+
+
+def get_odoo_data_dir() -> Optional[str]:
+    """Try to detect Odoo data_dir from configuration"""
+
+    # Method 1: Try to import Odoo and get data_dir from config
+    try:
+        import odoo
+        from odoo.tools import config
+
+        # Initialize Odoo config if not already done
+        if not hasattr(config, 'loaded'):
+            config.parse_config()
+
+        data_dir = config.get('data_dir')
+        if data_dir and os.path.exists(data_dir):
+            console.print(f"[green]✓ Found Odoo data_dir from config: {data_dir}[/green]")
+            return data_dir
+        elif data_dir:
+            console.print(f"[yellow]Found data_dir in config but path doesn't exist: {data_dir}[/yellow]")
+    except ImportError:
+        console.print("[dim]Odoo not available in Python path[/dim]")
+    except Exception as e:
+        console.print(f"[dim]Could not read Odoo config: {e}[/dim]")
+
+    # Method 2: Try to find and parse Odoo configuration files
     console.print(f"[dim]Searching for Odoo configuration files...[/dim]")
-    for config_path in config_locations:
-        expanded_path = os.path.expanduser(config_path)
-        if os.path.exists(expanded_path):
-            console.print(f"[dim]Found config file: {expanded_path}[/dim]")
-            data_dir = parse_odoo_config_file(expanded_path)
+    for config_path in CONFIG_LOCATIONS:
+        if os.path.exists(config_path):
+            console.print(f"[dim]Found config file: {config_path}[/dim]")
+            data_dir = parse_odoo_config_file(config_path)
             if data_dir:
                 return data_dir
 
     return None
 
 
+# Common Odoo data directories, searched for a known attachment
+DATA_DIR_LOCATIONS = tuple(dict.fromkeys([
+    "/var/lib/odoo/.local/share/Odoo",
+    "/home/odoo/.local/share/Odoo",
+    "/opt/odoo/data",
+    "/var/lib/odoo",
+    "/home/odoo/data",
+    os.path.expanduser("~/.local/share/Odoo"),
+]))
+
+
 def get_filestore_from_database(host: str, port: int, user: str, password: str, database: str) -> Optional[str]:
     """Get filestore path directly from Odoo database configuration"""
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=database
-        )
-        cur = conn.cursor()
-
-        # Method 1: Check ir_config_parameter for data_dir or filestore path
-        cur.execute("""
-            SELECT key, value FROM ir_config_parameter
-            WHERE key IN ('data_dir', 'database.filestore_path', 'ir_attachment.location')
-            ORDER BY
-                CASE key
-                    WHEN 'database.filestore_path' THEN 1
-                    WHEN 'data_dir' THEN 2
-                    WHEN 'ir_attachment.location' THEN 3
-                END
-        """)
-        results = cur.fetchall()
-
-        for key, value in results:
-            if not value:
-                continue
-
-            if key == 'database.filestore_path':
-                # Direct filestore path
-                if os.path.exists(value):
-                    console.print(f"[green]✓ Found filestore from database.filestore_path: {value}[/green]")
-                    cur.close()
-                    conn.close()
-                    return value
-            elif key == 'data_dir':
-                # Data directory, filestore should be data_dir/filestore/database
-                filestore_path = os.path.join(value, "filestore", database)
-                if os.path.exists(filestore_path):
-                    console.print(f"[green]✓ Found filestore from data_dir: {filestore_path}[/green]")
-                    cur.close()
-                    conn.close()
-                    return filestore_path
-            elif key == 'ir_attachment.location' and value == 'file':
-                console.print(f"[dim]Database configured to store attachments in filestore[/dim]")
-                # Continue to method 2
-
-        # Method 2: Get default data_dir from Odoo's internal logic
-        # Query the attachment table to see if there are any stored files
-        cur.execute("""
-            SELECT store_fname FROM ir_attachment
-            WHERE store_fname IS NOT NULL
-            AND store_fname != ''
-            LIMIT 1
-        """)
-        result = cur.fetchone()
-
-        if result and result[0]:
-            # We have stored files, now we need to find where they are
-            store_fname = result[0]
-            console.print(f"[dim]Found stored file reference: {store_fname}[/dim]")
-
-            # Try to locate this file in common locations
-            possible_base_dirs = [
-                "/var/lib/odoo/.local/share/Odoo",
-                "/home/odoo/.local/share/Odoo",
-                "/opt/odoo/data",
-                "/var/lib/odoo",
-                "/home/odoo/data",
-                os.path.expanduser("~/.local/share/Odoo"),
-            ]
-
-            for base_dir in possible_base_dirs:
-                test_path = os.path.join(base_dir, "filestore", database, store_fname[:2], store_fname)
-                if os.path.exists(test_path):
-                    filestore_path = os.path.join(base_dir, "filestore", database)
-                    console.print(f"[green]✓ Located filestore by file reference: {filestore_path}[/green]")
-                    cur.close()
-                    conn.close()
-                    return filestore_path
-
-        cur.close()
-        conn.close()
-        console.print("[yellow]⚠ No filestore configuration found in database[/yellow]")
-        return None
-
+        with pg_connection(host, port, user, password, database) as conn, conn.cursor() as cur:
+            # One round trip for both probes: the relevant ir_config_parameter
+            # entries, and one stored attachment to locate the filestore by
+            cur.execute("""
+                WITH cfg AS (
+                    SELECT key, value FROM ir_config_parameter
+                    WHERE key IN ('data_dir', 'database.filestore_path', 'ir_attachment.location')
+                ), att AS (
+                    SELECT store_fname FROM ir_attachment
+                    WHERE store_fname IS NOT NULL
+                    AND store_fname != ''
+                    LIMIT 1
+                )
+                SELECT 'cfg', key, value FROM cfg
+                UNION ALL
+                SELECT 'att', store_fname, NULL FROM att
+            """)
+            results = cur.fetchall()
     except Exception as e:
         console.print(f"[red]Error querying database for filestore: {e}[/red]")
         return None
 
+    config = {key: value for source, key, value in results if source == 'cfg'}
+    store_fname = next((key for source, key, _ in results if source == 'att'), None)
+
+    # Method 1: Check ir_config_parameter for data_dir or filestore path
+    for key in ('database.filestore_path', 'data_dir', 'ir_attachment.location'):
+        value = config.get(key)
+        if not value:
+            continue
+
+        if key == 'database.filestore_path':
+            # Direct filestore path
+            if _is_dir(value):
+                console.print(f"[green]✓ Found filestore from database.filestore_path: {value}[/green]")
+                return value
+        elif key == 'data_dir':
+            # Data directory, filestore should be data_dir/filestore/database
+            filestore_path = os.path.join(value, "filestore", database)
+            if _is_dir(filestore_path):
+                console.print(f"[green]✓ Found filestore from data_dir: {filestore_path}[/green]")
+                return filestore_path
+        elif key == 'ir_attachment.location' and value == 'file':
+            console.print(f"[dim]Database configured to store attachments in filestore[/dim]")
+            # Continue to method 2
+
+    # Method 2: Locate a stored attachment in the common data directories
+    if store_fname:
+        console.print(f"[dim]Found stored file reference: {store_fname}[/dim]")
+
+        # Try to locate this file in common locations
+        for base_dir in DATA_DIR_LOCATIONS:
+            # store_fname already includes the shard directory ("ab/ab12...")
+            test_path = os.path.join(base_dir, "filestore", database, store_fname)
+            if os.path.exists(test_path):
+                filestore_path = os.path.join(base_dir, "filestore", database)
+                console.print(f"[green]✓ Located filestore by file reference: {filestore_path}[/green]")
+                return filestore_path
+
+    console.print("[yellow]⚠ No filestore configuration found in database[/yellow]")
+    return None
+
+
+def _is_dir(path: str) -> bool:
+    """Check that a path is a directory with a single stat call"""
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _has_files(path: str) -> bool:
+    """Check whether a filestore holds a file, looking no deeper than its shard directories"""
+    shards, files = _scan_root(os.path.normpath(path))
+    if files:
+        return True
+    for shard in shards:
+        with os.scandir(shard) as entries:
+            if next(entries, None) is not None:
+                return True
+    return False
+
+
+def _existing_children(parent: str, names: List[str]) -> set:
+    """Return which of ``names`` exist in ``parent``, using one directory listing"""
+    try:
+        return set(names).intersection(os.listdir(parent))
+    except OSError:
+        return set()
+
 
 def detect_filestore_path(database: str) -> Optional[str]:
     """Detect Odoo filestore path automatically using Odoo's standard locations"""
@@ -293,9 +1154,17 @@ def detect_filestore_path(database: str) -> Optional[str]:
 
     possible_paths = []
 
-    # If we found Odoo data_dir, prioritize it (this is the most accurate)
+    # If we found Odoo data_dir, it is authoritative: use it without probing
+    # the other locations
     if odoo_data_dir:
-        possible_paths.append(os.path.join(odoo_data_dir, "filestore", database))
+        configured_path = os.path.join(odoo_data_dir, "filestore", database)
+        try:
+            if _is_dir(configured_path) and _has_files(configured_path):
+                console.print(f"[green]✓ Found filestore: {configured_path}[/green]")
+                return configured_path
+        except OSError:
+            pass
+        possible_paths.append(configured_path)
 
     # Method 2: Odoo default locations based on OS
     from pathlib import Path
@@ -336,18 +1205,27 @@ def detect_filestore_path(database: str) -> Optional[str]:
             os.path.join(home_dir, ".local", "share", "Odoo", "filestore", database),
         ])
 
-        # Common system users that might run Odoo
+        # Common system users that might run Odoo; list /var/lib and /home
+        # once instead of probing every path of users that do not exist
         odoo_users = ['odoo', 'odoo-server', 'openerp', 'erp']
+        var_lib_users = _existing_children("/var/lib", odoo_users)
+        home_users = _existing_children("/home", odoo_users)
         for user in odoo_users:
-            possible_paths.extend([
-                # System user XDG locations (very common in production)
-                f"/var/lib/{user}/.local/share/Odoo/filestore/{database}",
-                f"/home/{user}/.local/share/Odoo/filestore/{database}",
-                # Traditional data directories
-                f"/var/lib/{user}/filestore/{database}",
-                f"/home/{user}/data/filestore/{database}",
-                f"/home/{user}/odoo/filestore/{database}",
-            ])
+            in_var_lib = user in var_lib_users
+            in_home = user in home_users
+            # System user XDG locations (very common in production)
+            if in_var_lib:
+                possible_paths.append(f"/var/lib/{user}/.local/share/Odoo/filestore/{database}")
+            if in_home:
+                possible_paths.append(f"/home/{user}/.local/share/Odoo/filestore/{database}")
+            # Traditional data directories
+            if in_var_lib:
+                possible_paths.append(f"/var/lib/{user}/filestore/{database}")
+            if in_home:
+                possible_paths.extend([
+                    f"/home/{user}/data/filestore/{database}",
+                    f"/home/{user}/odoo/filestore/{database}",
+                ])
 
         # System-wide locations (common for production)
         possible_paths.extend([
@@ -374,14 +1252,17 @@ def detect_filestore_path(database: str) -> Optional[str]:
 
     console.print(f"[dim]Checking {len(possible_paths)} potential locations...[/dim]")
 
-    for i, path in enumerate(possible_paths, 1):
-        if os.path.exists(path) and os.path.isdir(path):
+    # The probes are independent, so stat all candidates concurrently; this
+    # matters when some of them live on slow network mounts
+    with ThreadPoolExecutor(max_workers=min(32, len(possible_paths))) as pool:
+        is_dir = list(pool.map(_is_dir, possible_paths))
+
+    for path, found in zip(possible_paths, is_dir):
+        if found:
             # Check if it looks like a real filestore (has some files)
             try:
-                files = list(Path(path).rglob('*'))
-                if len(files) > 0:  # Has some files
+                if _has_files(path):
                     console.print(f"[green]✓ Found filestore: {path}[/green]")
-                    console.print(f"[dim]  Contains {len(files)} files/directories[/dim]")
                     return path
                 else:
                     console.print(f"[dim]Found empty directory: {path}[/dim]")
@@ -397,16 +1278,44 @@ def detect_filestore_path(database: str) -> Optional[str]:
     return None
 
 
+def _read_crontab() -> str:
+    """Return the current user's crontab, or an empty string if there is none"""
+    # Read the cron spool directly when it is accessible (typically as root)
+    # instead of spawning crontab -l
+    if pwd is not None:
+        try:
+            user = pwd.getpwuid(os.geteuid()).pw_name
+            with open(os.path.join(CRON_SPOOL_DIR, user)) as f:
+                lines = f.read().splitlines(keepends=True)
+            # Like crontab -l, hide the header cron adds to installed crontabs
+            if lines and lines[0].startswith('# DO NOT EDIT THIS FILE'):
+                lines = lines[3:]
+            return ''.join(lines)
+        except (KeyError, OSError):
+            pass
+
+    result = subprocess.run(['crontab', '-l'], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else ""
+
+
+def _write_crontab(content: str) -> bool:
+    """Install new crontab content from a temporary file"""
+    with tempfile.NamedTemporaryFile('w', suffix='.crontab', delete=False) as f:
+        f.write(content)
+    try:
+        return subprocess.run(['crontab', f.name]).returncode == 0
+    finally:
+        os.unlink(f.name)
+
+
 def add_to_crontab(cron_line: str) -> bool:
     """Add or modify a line in user's crontab"""
     try:
         # Get current crontab
-        result = subprocess.run(['crontab', '-l'], capture_output=True, text=True)
-        current_crontab = result.stdout if result.returncode == 0 else ""
+        current_crontab = _read_crontab()
 
         # Check if a similar job already exists (looking for 'uvx obx' lines)
-        existing_lines = current_crontab.split('\n')
-        obx_lines = [line for line in existing_lines if 'uvx obx' in line]
+        obx_lines = OBX_CRON_LINE.findall(current_crontab)
 
         if obx_lines:
             console.print(f"[yellow]⚠ Found existing obx cron job(s):[/yellow]")
@@ -424,9 +1333,10 @@ def add_to_crontab(cron_line: str) -> bool:
                 return False
             elif action == "replace":
                 # Remove existing obx lines and add new one
-                new_lines = [line for line in existing_lines if 'uvx obx' not in line]
-                new_lines.append(cron_line.strip())
-                new_crontab = '\n'.join(new_lines) + '\n'
+                new_crontab = OBX_CRON_LINE.sub('', current_crontab)
+                if new_crontab and not new_crontab.endswith('\n'):
+                    new_crontab += '\n'
+                new_crontab += cron_line.strip() + '\n'
                 console.print("[green]Replacing existing obx cron job...[/green]")
             else:  # add
                 new_crontab = current_crontab + cron_line + "\n"
@@ -441,10 +1351,7 @@ def add_to_crontab(cron_line: str) -> bool:
             new_crontab = current_crontab + cron_line + "\n"
 
         # Write back to crontab
-        process = subprocess.Popen(['crontab', '-'], stdin=subprocess.PIPE, text=True)
-        process.communicate(input=new_crontab)
-
-        if process.returncode == 0:
+        if _write_crontab(new_crontab):
             console.print("[bold green]✅ Cron job updated successfully in your crontab![/bold green]")
             return True
         else:
@@ -497,7 +1404,32 @@ def setup_cron_job(command: str):
     console.print("\n[dim]💡 Tip: Test the command manually first to ensure it works![/dim]")
 
 
+def _load_config(ctx: click.Context, param: click.Parameter, path: Optional[str]):
+    """Use the settings of a TOML file as option defaults (--config callback)"""
+    if path is None:
+        return
+
+    with open(path, 'rb') as f:
+        try:
+            config = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise click.BadParameter(f"{path} is not valid TOML: {e}", ctx, param)
+
+    # Keys are option names, with dashes or underscores; options given on the
+    # command line still win
+    options = {opt.lstrip('-'): p.name for p in ctx.command.params for opt in p.opts}
+    defaults = {}
+    for key, value in config.items():
+        name = options.get(key.replace('_', '-'))
+        if name is None:
+            raise click.BadParameter(f"unknown setting '{key}' in {path}", ctx, param)
+        defaults[name] = value
+    ctx.default_map = {**(ctx.default_map or {}), **defaults}
+
+
 @click.command()
+@click.option('--config', type=click.Path(exists=True, dir_okay=False), callback=_load_config,
+              is_eager=True, expose_value=False, help='TOML file with default values for these options')
 @click.option('--host', default=None, help='PostgreSQL host')
 @click.option('--port', default=None, type=int, help='PostgreSQL port')
 @click.option('--user', default=None, help='PostgreSQL user')
@@ -505,14 +1437,52 @@ def setup_cron_job(command: str):
 @click.option('--database', default=None, help='Database name')
 @click.option('--filestore-path', default=None, help='Odoo filestore path')
 @click.option('--output-path', default=None, help='Output directory for backups')
+@click.option('--compression-level', default=None, type=click.IntRange(0, 22),
+              help='Compression level, 0 = store only, 1 = fastest, 9 = smallest DEFLATE, '
+                   f'up to 22 for tar.zst [default: {ZSTD_LEVEL} for tar.zst, 1 otherwise]')
+@click.option('--jobs', default=1, type=click.IntRange(min=0), show_default=True,
+              help='Parallel pg_dump jobs, 0 = half the CPUs; above 1 the database is dumped '
+                   'in directory format')
+@click.option('--format', 'archive_format', default='zip', type=click.Choice(['zip', 'tar.gz', 'tar.zst']),
+              show_default=True, help='Backup archive format')
+@click.option('--pg-compress', default=None,
+              help='Let pg_dump compress the dump itself: a level such as 1 with any pg_dump, or '
+                   'METHOD[:LEVEL] (gzip:1, zstd:3, lz4) with pg_dump 16+; the dump is then '
+                   'stored as a pg_restore archive')
+@click.option('--store-only', is_flag=True,
+              help='Store files without compression (for storage that compresses on its own)')
+@click.option('--incremental', is_flag=True,
+              help='Only back up filestore files added or changed since the last incremental backup')
 @click.option('--setup-cron', is_flag=True, help='Setup cron job for automated backups')
 @click.option('--non-interactive', is_flag=True, help='Run in non-interactive mode')
-def main(host, port, user, password, database, filestore_path, output_path, setup_cron, non_interactive):
+def main(host, port, user, password, database, filestore_path, output_path, compression_level, jobs,
+         archive_format, pg_compress, store_only, incremental, setup_cron, non_interactive):
     """Odoo Backup Tool - Interactive backup for Odoo databases and filestore"""
 
     console.print("[bold blue]🗄️  Odoo Backup Tool[/bold blue]")
     console.print()
 
+    if store_only:
+        compression_level = 0
+    elif compression_level is None:
+        compression_level = ZSTD_LEVEL if archive_format == 'tar.zst' else 1
+    elif compression_level > 9 and archive_format != 'tar.zst':
+        console.print(f"[red]--compression-level {compression_level} needs --format tar.zst; "
+                      f"DEFLATE levels go up to 9[/red]")
+        sys.exit(1)
+
+    if pg_compress and not pg_compress.split(':')[0].isdigit() and _pg_dump_major_version() < 16:
+        console.print(f"[red]--pg-compress {pg_compress} needs pg_dump 16 or later; "
+                      f"use a level such as 1 with older versions[/red]")
+        sys.exit(1)
+
+    # Resolved here rather than stored in cron, so a cron job follows the machine
+    dump_jobs = jobs or max(1, (os.cpu_count() or 1) // 2)
+
+    if archive_format == 'tar.zst' and compression_level and zstandard is None:
+        console.print("[red]tar.zst backups need the zstandard package: pip install \"obx[zstd]\"[/red]")
+        sys.exit(1)
+
     # Interactive mode if parameters not provided
     if not non_interactive:
         if not host:
@@ -539,6 +1509,9 @@ def main(host, port, user, password, database, filestore_path, output_path, setu
             console.print("[red]No databases found[/red]")
             sys.exit(1)
 
+        # Only needed to pick a database interactively, so not imported at startup
+        from rich.table import Table
+
         table = Table()
         table.add_column("Index", style="cyan")
         table.add_column("Database", style="green")
@@ -596,32 +1569,27 @@ def main(host, port, user, password, database, filestore_path, output_path, setu
         sys.exit(0)
 
     # Create backup
-    with tempfile.TemporaryDirectory() as temp_dir:
-        console.print("\n[bold]Creating backup...[/bold]")
+    console.print("\n[bold]Creating backup...[/bold]")
+    console.print("📊 Backing up database...")
 
-        # Database backup
-        db_backup_file = os.path.join(temp_dir, f"{database}.sql")
-        console.print("📊 Backing up database...")
-        if not create_db_backup(host, port, user, password, database, db_backup_file):
-            sys.exit(1)
-
-        # Filestore backup
-        filestore_backup_file = None
-        if filestore_path and os.path.exists(filestore_path):
-            console.print("📁 Backing up filestore...")
-            filestore_backup_file = create_filestore_backup(filestore_path, temp_dir)
-
-        # Create final backup
-        console.print("🗜️  Creating final backup...")
-        backup_file = create_full_backup(db_backup_file, filestore_backup_file, output_path, database)
+    if archive_format != 'zip':
+        backup_file = create_tar_backup(host, port, user, password, database, filestore_path,
+                                        output_path, dump_jobs, incremental, compression_level,
+                                        archive_format.split('.')[1], pg_compress)
+    else:
+        backup_file = create_full_backup(host, port, user, password, database, filestore_path,
+                                         output_path, compression_level, dump_jobs, incremental,
+                                         pg_compress)
+    if not backup_file:
+        sys.exit(1)
 
-        console.print(f"\n[bold green]✅ Backup completed successfully![/bold green]")
-        console.print(f"[green]Backup saved to: {backup_file}[/green]")
+    console.print(f"\n[bold green]✅ Backup completed successfully![/bold green]")
+    console.print(f"[green]Backup saved to: {backup_file}[/green]")
 
-        # File size
-        backup_size = os.path.getsize(backup_file)
-        size_mb = backup_size / (1024 * 1024)
-        console.print(f"[blue]Backup size: {size_mb:.2f} MB[/blue]")
+    # File size
+    backup_size = os.path.getsize(backup_file)
+    size_mb = backup_size / (1024 * 1024)
+    console.print(f"[blue]Backup size: {size_mb:.2f} MB[/blue]")
 
     # Ask about cron setup in interactive mode
     if not setup_cron and not non_interactive:
@@ -639,8 +1607,15 @@ def main(host, port, user, password, database, filestore_path, output_path, setu
             f"--database {database}",
             f"--filestore-path '{filestore_path}'",
             f"--output-path '{output_path}'",
+            f"--compression-level {compression_level}",
+            f"--jobs {jobs}",
+            f"--format {archive_format}",
             "--non-interactive"
         ]
+        if pg_compress:
+            command_parts.append(f"--pg-compress {pg_compress}")
+        if incremental:
+            command_parts.append("--incremental")
         if password:
             command_parts.append(f"--password '{password}'")
 
@@ -0,0 +1,96 @@
+"""Tests for the command-line options, the --config file and crontab handling"""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from odoo_backup import cli
+
+
+def _params(*args):
+    """Parse a command line without running the backup"""
+    return cli.main.make_context("obx", list(args)).params
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Write a TOML config file and return its path"""
+    def write(text):
+        path = tmp_path / "obx.toml"
+        path.write_text(text)
+        return str(path)
+    return write
+
+
+def test_config_sets_defaults(config):
+    path = config('host = "db.example.com"\n'
+                  'output-path = "/backups"\n'
+                  'compression_level = 6\n'
+                  'non-interactive = true\n')
+    params = _params("--config", path)
+    assert params["host"] == "db.example.com"
+    assert params["output_path"] == "/backups"
+    assert params["compression_level"] == 6
+    assert params["non_interactive"] is True
+
+
+def test_command_line_overrides_config(config):
+    path = config('host = "db.example.com"\nport = 5433\n')
+    params = _params("--host", "localhost", "--config", path)
+    assert params["host"] == "localhost"
+    assert params["port"] == 5433
+
+
+def test_config_rejects_unknown_keys(config):
+    path = config('hots = "db.example.com"\n')
+    result = CliRunner().invoke(cli.main, ["--config", path])
+    assert result.exit_code == 2
+    assert "unknown setting 'hots'" in result.output
+
+
+def test_config_rejects_invalid_toml(config):
+    path = config('host = db.example.com\n')
+    result = CliRunner().invoke(cli.main, ["--config", path])
+    assert result.exit_code == 2
+    assert "is not valid TOML" in result.output
+
+
+@pytest.mark.parametrize("crontab, found", [
+    ("0 2 * * * uvx obx --database db --non-interactive\n", True),
+    ("0 2 * * *\tuvx\tobx --non-interactive\n", True),
+    ("# 0 2 * * * uvx obx --non-interactive\n", False),
+    ("0 2 * * * uvx obxtra\n", False),
+    # The pattern must not run across lines
+    ("5 5 * * * echo uvx\nobx-thing\n", False),
+])
+def test_obx_cron_line(crontab, found):
+    assert bool(cli.OBX_CRON_LINE.search(crontab)) is found
+
+
+def test_obx_cron_line_removal_keeps_other_jobs():
+    crontab = ("MAILTO=admin\n"
+               "0 2 * * * uvx obx --database db --non-interactive\n"
+               "30 3 * * * /usr/local/bin/cleanup\n")
+    assert cli.OBX_CRON_LINE.sub('', crontab) == "MAILTO=admin\n30 3 * * * /usr/local/bin/cleanup\n"
+
+
+def test_read_crontab_strips_spool_header(tmp_path, monkeypatch):
+    pwd = pytest.importorskip("pwd")
+    user = pwd.getpwuid(os.geteuid()).pw_name
+    (tmp_path / user).write_text(
+        "# DO NOT EDIT THIS FILE - edit the master and reinstall.\n"
+        "# (/tmp/crontab.XXXX installed on Thu Oct 15 02:00:00 2026)\n"
+        "# (Cron version -- $Id: crontab.c,v 2.13 1994/01/17 03:20:37 vixie Exp $)\n"
+        "0 2 * * * uvx obx --non-interactive\n")
+    monkeypatch.setattr(cli, "CRON_SPOOL_DIR", str(tmp_path))
+    assert cli._read_crontab() == "0 2 * * * uvx obx --non-interactive\n"
+
+
+def test_read_crontab_keeps_crontab_without_header(tmp_path, monkeypatch):
+    pwd = pytest.importorskip("pwd")
+    user = pwd.getpwuid(os.geteuid()).pw_name
+    crontab = "# nightly backup\n0 2 * * * uvx obx --non-interactive\n"
+    (tmp_path / user).write_text(crontab)
+    monkeypatch.setattr(cli, "CRON_SPOOL_DIR", str(tmp_path))
+    assert cli._read_crontab() == crontab
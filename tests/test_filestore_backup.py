@@ -0,0 +1,103 @@
+"""Round-trip tests for the zip writer used by filestore backups"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+from odoo_backup import cli
+
+
+@pytest.fixture
+def filestore(tmp_path):
+    """A small Odoo-like filestore with every kind of file the writer handles"""
+    root = tmp_path / "filestore" / "db"
+    files = {
+        "ab/text": b"compressible line of text\n" * 2000,
+        "ab/random": os.urandom(50_000),
+        "cd/image.png": b"\x89PNG\r\n\x1a\n" + os.urandom(10_000),
+        "cd/empty": b"",
+        "ef/large_text": b"large compressible attachment\n" * (cli.MAX_BUFFERED_FILE_SIZE // 30 + 1),
+        "ef/large_random": os.urandom(cli.MAX_BUFFERED_FILE_SIZE + 1),
+        "loose": b"file at the top of the filestore",
+    }
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return root, files
+
+
+def _fake_db_backup(host, port, user, password, database, zipf, jobs=1, pg_compress=None):
+    zipf.writestr(f"{database}.sql", "-- dump\n")
+    return True
+
+
+def _backup(filestore_root, output, monkeypatch, **kwargs):
+    monkeypatch.setattr(cli, "create_db_backup", _fake_db_backup)
+    return cli.create_full_backup("localhost", 5432, "odoo", "", "db", str(filestore_root),
+                                  str(output), **kwargs)
+
+
+def _filestore_members(zipf):
+    prefix = "filestore" + os.sep
+    return {info.filename[len(prefix):]: info for info in zipf.infolist()
+            if info.filename.startswith(prefix)}
+
+
+@pytest.mark.parametrize("level", [0, 1, 6])
+def test_full_backup_round_trip(filestore, tmp_path, monkeypatch, level):
+    root, files = filestore
+    backup = _backup(root, tmp_path / "out", monkeypatch, level=level)
+
+    with zipfile.ZipFile(backup) as zipf:
+        assert zipf.testzip() is None
+        members = _filestore_members(zipf)
+        assert set(members) == {name.replace("/", os.sep) for name in files}
+        for name, data in files.items():
+            assert zipf.read(members[name.replace("/", os.sep)]) == data
+        assert zipf.read("db.sql") == b"-- dump\n"
+
+    stored = {name for name, info in members.items() if info.compress_type == zipfile.ZIP_STORED}
+    if level == 0:
+        assert stored == set(members)
+    else:
+        # Already-compressed data is stored, the rest deflated
+        assert {os.path.join("ab", "random"), os.path.join("cd", "image.png"),
+                os.path.join("ef", "large_random")} <= stored
+        assert os.path.join("ab", "text") not in stored
+        assert os.path.join("ef", "large_text") not in stored
+
+
+def test_incremental_backup_pair(filestore, tmp_path, monkeypatch):
+    root, files = filestore
+    output = tmp_path / "out"
+
+    first = _backup(root, output, monkeypatch, incremental=True)
+    with open(first + cli.MANIFEST_SUFFIX) as f:
+        first_manifest = json.load(f)
+    assert first_manifest["base"] is None
+    assert len(first_manifest["files"]) == len(files)
+
+    changed = root / "ab" / "text"
+    changed.write_bytes(b"changed")
+    added = root / "gh" / "new"
+    added.parent.mkdir()
+    added.write_bytes(b"new attachment")
+
+    # Backup names carry a timestamp with one-second resolution
+    monkeypatch.setattr(cli, "_backup_path",
+                        lambda output_path, database, extension: os.path.join(
+                            output_path, f"{database}_20990101_000000.{extension}"))
+    second = _backup(root, output, monkeypatch, incremental=True)
+
+    with zipfile.ZipFile(second) as zipf:
+        assert zipf.testzip() is None
+        members = _filestore_members(zipf)
+        assert set(members) == {os.path.join("ab", "text"), os.path.join("gh", "new")}
+        assert zipf.read(members[os.path.join("ab", "text")]) == b"changed"
+        manifest = json.loads(zipf.read(cli.MANIFEST_NAME))
+
+    assert manifest["base"] == os.path.basename(first)
+    assert len(manifest["files"]) == len(files) + 1
@@ -0,0 +1,204 @@
+"""Round-trip tests for tar backups, with a fake pg_dump on PATH"""
+
+import json
+import os
+import sys
+import tarfile
+import zlib
+
+import pytest
+
+from odoo_backup import cli
+
+FAKE_PG_DUMP = """#!{python}
+import os
+import sys
+
+args = sys.argv[1:]
+if args == ['--version']:
+    print('pg_dump (PostgreSQL) 16.2')
+    sys.exit(0)
+with open(os.path.join(os.path.dirname(__file__), 'calls.log'), 'a') as log:
+    log.write(' '.join(args) + '\\n')
+output = args[args.index('-f') + 1]
+if '-Fd' in args:
+    os.mkdir(output)
+    with open(os.path.join(output, 'toc.dat'), 'wb') as f:
+        f.write(b'toc')
+    with open(os.path.join(output, '3001.dat'), 'wb') as f:
+        f.write(b'table data\\n' * 100)
+elif '-Fc' in args:
+    with open(output, 'wb') as f:
+        f.write(b'PGDMP custom dump')
+else:
+    with open(output, 'w') as f:
+        f.write('-- dump\\n')
+"""
+
+
+@pytest.fixture
+def pg_dump(tmp_path, monkeypatch):
+    """Put a fake pg_dump on PATH; returns the log of its command lines"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pg_dump"
+    script.write_text(FAKE_PG_DUMP.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    cli._pg_dump_major_version.cache_clear()
+    yield bin_dir / "calls.log"
+    cli._pg_dump_major_version.cache_clear()
+
+
+@pytest.fixture
+def filestore(tmp_path):
+    """A filestore with small files and one too large for the reader threads to buffer"""
+    root = tmp_path / "filestore" / "db"
+    files = {
+        "ab/text": b"compressible line of text\n" * 2000,
+        "ab/random": os.urandom(50_000),
+        "cd/empty": b"",
+        "ef/large": b"large compressible attachment\n" * (cli.COPY_CHUNK_SIZE // 30 + 1),
+        "loose": b"file at the top of the filestore",
+    }
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return root, files
+
+
+def _backup(filestore_root, output, **kwargs):
+    output.mkdir(exist_ok=True)
+    filestore_path = str(filestore_root) if filestore_root is not None else None
+    return cli.create_tar_backup("localhost", 5432, "odoo", "", "db", filestore_path,
+                                 str(output), **kwargs)
+
+
+def _filestore_members(tar):
+    prefix = "filestore" + os.sep
+    return {member.name[len(prefix):].replace(os.sep, "/"): member for member in tar.getmembers()
+            if member.name.startswith(prefix)}
+
+
+def _gzip_member_count(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    count = 0
+    while data:
+        decompressor = zlib.decompressobj(31)
+        decompressor.decompress(data)
+        assert decompressor.eof
+        data = decompressor.unused_data
+        count += 1
+    return count
+
+
+def _check_round_trip(backup, mode, files):
+    with tarfile.open(backup, mode) as tar:
+        members = _filestore_members(tar)
+        assert set(members) == set(files)
+        for name, data in files.items():
+            assert tar.extractfile(members[name]).read() == data
+        assert tar.extractfile("db.sql").read() == b"-- dump\n"
+
+
+def test_tar_gz_round_trip(filestore, tmp_path, pg_dump):
+    root, files = filestore
+    backup = _backup(root, tmp_path / "out", level=1, codec="gz")
+
+    assert backup.endswith(".tar.gz")
+    _check_round_trip(backup, "r:gz", files)
+    # The stream is cut into GZIP_BLOCK_SIZE blocks, each its own gzip member
+    assert _gzip_member_count(backup) > 1
+
+
+def test_plain_tar_at_level_0(filestore, tmp_path, pg_dump):
+    root, files = filestore
+    backup = _backup(root, tmp_path / "out", level=0, codec="gz")
+
+    assert backup.endswith(".tar") and not backup.endswith(".tar.gz")
+    _check_round_trip(backup, "r:", files)
+
+
+def test_tar_zst_round_trip(filestore, tmp_path, pg_dump):
+    zstandard = pytest.importorskip("zstandard")
+    root, files = filestore
+    backup = _backup(root, tmp_path / "out", level=3, codec="zst")
+
+    assert backup.endswith(".tar.zst")
+    plain = tmp_path / "backup.tar"
+    with open(backup, "rb") as src, open(plain, "wb") as dest:
+        zstandard.ZstdDecompressor().copy_stream(src, dest)
+    _check_round_trip(str(plain), "r:", files)
+
+
+def test_tar_info_headers(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(b"attachment")
+    path.chmod(0o640)
+    st = os.stat(path)
+
+    info = cli._tar_info("filestore/ab/file", st)
+    assert info.name == "filestore/ab/file"
+    assert info.isreg()
+    assert info.size == len(b"attachment")
+    assert info.mode == 0o640
+    assert int(info.mtime) == int(st.st_mtime)
+    assert (info.uid, info.gid) == (st.st_uid, st.st_gid)
+    assert (info.uname, info.gname) == cli._owner_names(st.st_uid, st.st_gid)
+
+    # Directories and other non-regular files get no header
+    assert cli._tar_info("filestore/ab", os.stat(tmp_path)) is None
+
+
+def test_incremental_tar_backup_pair(filestore, tmp_path, pg_dump, monkeypatch):
+    root, files = filestore
+    output = tmp_path / "out"
+
+    first = _backup(root, output, level=1, codec="gz", incremental=True)
+    with open(first + cli.MANIFEST_SUFFIX) as f:
+        first_manifest = json.load(f)
+    assert first_manifest["base"] is None
+    assert len(first_manifest["files"]) == len(files)
+
+    (root / "ab" / "text").write_bytes(b"changed")
+
+    # Backup names carry a timestamp with one-second resolution
+    monkeypatch.setattr(cli, "_backup_path",
+                        lambda output_path, database, extension: os.path.join(
+                            output_path, f"{database}_20990101_000000.{extension}"))
+    second = _backup(root, output, level=1, codec="gz", incremental=True)
+
+    with tarfile.open(second, "r:gz") as tar:
+        assert set(_filestore_members(tar)) == {"ab/text"}
+        assert tar.extractfile(os.path.join("filestore", "ab", "text")).read() == b"changed"
+        manifest = json.loads(tar.extractfile(cli.MANIFEST_NAME).read())
+
+    assert manifest["base"] == os.path.basename(first)
+    assert len(manifest["files"]) == len(files)
+
+
+def test_directory_dump_with_jobs(tmp_path, pg_dump):
+    backup = _backup(None, tmp_path / "out", level=1, codec="gz", jobs=4)
+
+    with tarfile.open(backup, "r:gz") as tar:
+        names = set(tar.getnames())
+        assert {"db.dump", "db.dump/toc.dat", "db.dump/3001.dat"} <= names
+        assert tar.extractfile("db.dump/3001.dat").read() == b"table data\n" * 100
+
+    args = pg_dump.read_text().split()
+    # The archive is the only compression pass
+    assert args[args.index("-Fd") + 1:args.index("-Fd") + 5] == ["-j", "4", "--compress", "0"]
+
+
+def test_custom_format_dump_with_pg_compress(tmp_path, pg_dump):
+    backup = _backup(None, tmp_path / "out", level=1, codec="gz", pg_compress="zstd:3")
+
+    with tarfile.open(backup, "r:gz") as tar:
+        assert tar.getnames() == ["db.dump"]
+        assert tar.extractfile("db.dump").read() == b"PGDMP custom dump"
+
+    args = pg_dump.read_text().split()
+    assert "-Fc" in args
+    assert args[args.index("--compress") + 1] == "zstd:3"